@@ -1,8 +1,298 @@
 import vosk
 import pyaudio
+import atexit
 import json
+import os
+import ctypes.util
+import functools
+import multiprocessing
+import re
+import signal
+import struct
+import sys
 import threading
-from typing import Callable, Dict, Optional
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _compile_keyword_re(keywords) -> re.Pattern:
+    """
+    Compile keywords into one whole-word regex alternation.
+
+    Used when pyahocorasick is not installed. Longer keywords come first so
+    that e.g. 'players' is preferred over 'player'.
+    """
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(r"\b(" + alternation + r")\b")
+
+
+def _collect_hyperscan_match(match_id: int, start: int, end: int, flags: int, context: list) -> None:
+    """Hyperscan match handler: record the id and end offset of the matched keyword."""
+    context.append((match_id, end))
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Check that text[index] is outside the string or not a word character (as in \\b)."""
+    if index < 0 or index >= len(text):
+        return True
+    char = text[index]
+    return not (char.isalnum() or char == "_")
+
+
+def _partial_span(raw_partial: str) -> Optional[Tuple[int, int]]:
+    """
+    Locate the text of a '{"partial" : "..."}' result without parsing the JSON.
+
+    Args:
+        raw_partial: JSON partial result from the recognizer
+
+    Returns:
+        (start, end) indices of the partial text in raw_partial, or None if
+        the result does not have the expected shape
+    """
+    key = raw_partial.find('"partial"')
+    if key < 0:
+        return None
+    start = raw_partial.find('"', key + len('"partial"')) + 1
+    end = raw_partial.find('"', start)
+    if start == 0 or end < 0 or raw_partial.find('\\', start, end) >= 0:
+        return None
+    return start, end
+
+
+@functools.lru_cache(maxsize=2)
+def _load_model(model_path: str, batch: bool = False):
+    """
+    Load a Vosk model once per path and reuse it across detector starts.
+
+    Models are large, so this skips the disk I/O and graph setup after the
+    first start. Cached models stay in memory until the interpreter exits.
+
+    Args:
+        model_path: Path to Vosk model directory
+        batch: Load a GPU BatchModel instead of a CPU Model
+    """
+    if batch:
+        vosk.GpuInit()
+        return vosk.BatchModel(model_path)
+    return vosk.Model(model_path)
+
+
+def _cuda_available() -> bool:
+    """Check whether an NVIDIA CUDA driver library is present on this machine."""
+    return ctypes.util.find_library("cuda") is not None
+
+
+# Each ring buffer slot holds the byte length of the chunk followed by its int16 samples
+_SLOT_HEADER = struct.Struct("<I")
+
+
+def _create_recognizer(
+    model_path: str,
+    rate: int,
+    use_gpu: bool,
+    use_grammar: bool,
+    verbose: bool,
+    grammar: Optional[str]
+) -> Tuple[object, bool]:
+    """
+    Create the Vosk recognizer.
+
+    The batched GPU decoder takes no grammar and produces no partial results,
+    so keywords would only fire once an utterance ends. It is therefore only
+    used when grammars are disabled; otherwise the grammar-constrained CPU
+    recognizer is preferred.
+
+    Args:
+        model_path: Path to Vosk model directory
+        rate: Audio sample rate in Hz
+        use_gpu: Try Vosk's batch recognizer when CUDA is available
+        use_grammar: Whether keyword grammars are enabled
+        verbose: Whether to print which recognizer is used
+        grammar: JSON list of words to restrict the CPU recognizer to, or None
+
+    Returns:
+        (recognizer, batch) where batch is True for the GPU batch recognizer
+    """
+    if verbose:
+        print(f"Loading Vosk model from {model_path}...")
+
+    gpu_available = use_gpu and hasattr(vosk, "BatchModel") and _cuda_available()
+    if gpu_available and use_grammar:
+        if verbose:
+            print("Using CPU recognizer: the GPU batch recognizer has no keyword grammar "
+                  "or partial results (pass use_grammar=False to decode on the GPU)")
+    elif gpu_available:
+        try:
+            recognizer = vosk.BatchRecognizer(_load_model(model_path, batch=True), rate)
+            if verbose:
+                print("Using GPU batch recognizer (keywords fire on final results only)")
+            return recognizer, True
+        except Exception as e:
+            print(f"GPU recognizer unavailable, falling back to CPU: {e}")
+
+    model = _load_model(model_path)
+    if grammar is not None:
+        recognizer = vosk.KaldiRecognizer(model, rate, grammar)
+    else:
+        recognizer = vosk.KaldiRecognizer(model, rate)
+    recognizer.SetMaxAlternatives(0)
+    return recognizer, False
+
+
+def _raise_priority(realtime_priority: int, fallback_nice: int, verbose: bool) -> None:
+    """
+    Raise the scheduling priority of the calling process.
+
+    Tries SCHED_FIFO first, then a negative nice value. Both need
+    CAP_SYS_NICE; without it the process keeps its default priority.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(realtime_priority))
+        if verbose:
+            print("Recognizer running with real-time priority")
+        return
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        os.nice(fallback_nice)
+        if verbose:
+            print(f"Recognizer running with nice {fallback_nice}")
+    except (AttributeError, OSError):
+        if verbose:
+            print("Could not raise recognizer priority (needs CAP_SYS_NICE)")
+
+
+def _asr_worker(ring_name, slots, slot_size, written, data_ready, commands, results, options) -> None:
+    """
+    Decode audio from the shared ring buffer (runs in a separate process).
+
+    The recognizer has its own interpreter and GIL here, so decoding does not
+    contend with the threads of the controlling process. Commands arrive on
+    the commands queue:
+
+        ("start", grammar, session)  create a fresh recognizer, skip buffered audio
+        ("grammar", grammar)         switch the running recognizer to new keywords
+        ("stop",)                    stop decoding until the next start
+        ("close",)                   exit
+
+    Every start is answered with (session, "ready", None), or with
+    (session, "failed", message) if the recognizer could not be created, and
+    raw recognizer output is sent back as (session, "result" | "partial", json).
+    A decoding error is reported as "failed" too and ends the process.
+
+    Args:
+        ring_name: Name of the shared memory ring buffer
+        slots: Number of chunk slots in the ring
+        slot_size: Size of one slot in bytes
+        written: Shared counter of chunks written into the ring
+        data_ready: Event set whenever a chunk or a command is available
+        commands: Queue of commands from the controlling process
+        results: Queue of recognizer output for the controlling process
+        options: Recognizer and scheduling settings of the detector
+    """
+    # Ctrl+C reaches the whole process group; the controlling process handles it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    verbose = options["verbose"]
+    if verbose and hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True)
+    _raise_priority(options["realtime_priority"], options["fallback_nice"], verbose)
+
+    ring = shared_memory.SharedMemory(name=ring_name)
+    recognizer = None
+    batch = False
+    session = None
+    read = 0  # Number of chunks consumed from the ring
+    last_partial = None
+    try:
+        while True:
+            # Cleared before checking for work so a set() in between is not lost
+            data_ready.clear()
+            while not commands.empty():
+                command = commands.get()
+                if command[0] == "start":
+                    _, grammar, session = command
+                    try:
+                        recognizer, batch = _create_recognizer(
+                            options["model_path"], options["rate"], options["use_gpu"],
+                            options["use_grammar"], verbose, grammar
+                        )
+                    except Exception as e:
+                        recognizer = None
+                        results.put((session, "failed", f"{type(e).__name__}: {e}"))
+                        continue
+                    read = written.value
+                    last_partial = None
+                    results.put((session, "ready", None))
+                elif command[0] == "grammar":
+                    # Applied here because the recognizer is not thread-safe
+                    if recognizer is not None and not batch:
+                        recognizer.SetGrammar(command[1])
+                elif command[0] == "stop":
+                    recognizer = None
+                elif command[0] == "close":
+                    return
+
+            head = written.value
+            available = head - read
+            if recognizer is None or available == 0:
+                data_ready.wait()
+                continue
+            if available >= slots:
+                # A full ring behind: the oldest slot is overwritten next (or
+                # already was), so skip to the oldest chunk that is still safe
+                if verbose:
+                    print(f"Recognizer dropped {available - slots + 1} audio chunks")
+                read = head - slots + 1
+
+            offset = (read % slots) * slot_size
+            (length,) = _SLOT_HEADER.unpack_from(ring.buf, offset)
+            start = offset + _SLOT_HEADER.size
+            data = bytes(ring.buf[start:start + length])
+            read += 1
+            if written.value - (read - 1) >= slots:
+                # The writer lapped this slot while it was being copied (seqlock check)
+                continue
+
+            if batch:
+                # The batch decoder runs asynchronously on the GPU and only
+                # produces final results, which are polled after every chunk
+                recognizer.AcceptWaveform(data)
+                raw_result = recognizer.Result()
+                if raw_result:
+                    results.put((session, "result", raw_result))
+            elif recognizer.AcceptWaveform(data):
+                results.put((session, "result", recognizer.Result()))
+                last_partial = None
+            else:
+                raw_partial = recognizer.PartialResult()
+                # Partials repeat while nothing new is heard; skip the copies
+                if raw_partial != last_partial:
+                    last_partial = raw_partial
+                    results.put((session, "partial", raw_partial))
+
+    except Exception as e:
+        results.put((session, "failed", f"{type(e).__name__}: {e}"))
+    finally:
+        ring.close()
 
 
 class AudioKeywordDetector:
@@ -11,18 +301,30 @@ class AudioKeywordDetector:
 
     Listens to microphone input and triggers callbacks when specific keywords
     are detected in the transcribed speech.
+
+    Recognition runs in a separate process that reads the captured audio from
+    a shared memory ring buffer, so decoding has its own GIL. That process
+    asks for real-time scheduling to keep up with the small audio chunks;
+    grant CAP_SYS_NICE (or run as root) for this to take effect.
     """
 
     DEFAULT_MODEL_PATH = "model/vosk-model-small-en-us-0.15"
     DEFAULT_RATE = 16000
-    DEFAULT_CHUNK = 8000
+    DEFAULT_CHUNK = 2000  # 125 ms at 16 kHz
+    REALTIME_PRIORITY = 20
+    PARTIAL_PRINT_INTERVAL = 0.25  # Minimum seconds between printed partial results
+    FALLBACK_NICE = -10
+    RING_SLOTS = 32  # Audio chunks buffered for the recognizer process (4 s at the defaults)
+    WORKER_JOIN_TIMEOUT = 2.0
 
     def __init__(
         self,
         model_path: str = DEFAULT_MODEL_PATH,
         rate: int = DEFAULT_RATE,
         chunk: int = DEFAULT_CHUNK,
-        verbose: bool = True
+        verbose: bool = True,
+        use_gpu: bool = True,
+        use_grammar: bool = True
     ):
         """
         Initialize the audio keyword detector.
@@ -32,46 +334,247 @@ class AudioKeywordDetector:
             rate: Audio sample rate in Hz
             chunk: Audio chunk size for processing
             verbose: Whether to print recognition results
+            use_gpu: Decode on the GPU with Vosk's batch recognizer when CUDA is
+                     available (requires a Vosk build with HAVE_CUDA=1). Only
+                     takes effect with use_grammar=False, since the batch
+                     recognizer has no grammar and no partial results
+            use_grammar: Restrict the CPU recognizer to the registered keywords,
+                         which shrinks the decoding graph and cuts latency
         """
         self.model_path = model_path
         self.rate = rate
         self.chunk = chunk
         self.verbose = verbose
+        self.use_gpu = use_gpu
+        self.use_grammar = use_grammar
 
-        self._model = None
-        self._recognizer = None
         self._audio = None
         self._stream = None
+        self._ctx = multiprocessing.get_context("spawn")  # Forking after PortAudio starts is unsafe
+        self._ring = None  # Shared memory ring of audio chunks
+        self._slot_size = _SLOT_HEADER.size + 2 * chunk  # paInt16 mono
+        self._written = None  # Shared count of chunks written into the ring
+        self._data_ready = None
+        self._commands = None
+        self._results = None
+        self._worker = None
+        self._session = 0  # Tags recognizer output so a restart ignores stale results
         self._running = False
         self._thread = None
-        self._callbacks: Dict[str, Callable] = {}
+        self._callbacks: Dict[str, Tuple[str, Callable]] = {}  # Word -> (keyword, callback)
+        self._hyperscan_db = None  # Built lazily when hyperscan is installed
+        self._hyperscan_keywords = []  # Keyword for each hyperscan pattern id
+        self._hyperscan_lengths = []  # UTF-8 length of each hyperscan keyword
+        self._automaton = None  # Built lazily when only pyahocorasick is installed
+        self._keyword_re = None  # Built lazily otherwise
+        self._fired = set()  # Keywords (not aliases) already triggered in the current utterance
+        self._last_partial_print = 0.0
 
     def register_keyword(self, keyword: str, callback: Callable, aliases: list = None) -> None:
         """
         Register a callback function for a specific keyword.
 
+        The keyword and its aliases are normalized once here into the word
+        table used by the matchers; registering a keyword again replaces its
+        previous aliases.
+
         Args:
             keyword: The keyword to detect (case-insensitive)
             callback: Function to call when keyword is detected
             aliases: Optional list of alternative words that trigger the same callback
         """
-        self._callbacks[keyword.lower()] = callback
-        if aliases:
-            for alias in aliases:
-                self._callbacks[alias.lower()] = callback
+        keyword = keyword.lower()
+        self._remove_words(keyword)
+        for word in {keyword, *(alias.lower() for alias in aliases or ())}:
+            self._callbacks[word] = (keyword, callback)
+        self._invalidate_matcher()
 
     def unregister_keyword(self, keyword: str) -> None:
-        """Remove a keyword callback."""
-        self._callbacks.pop(keyword.lower(), None)
+        """Remove a keyword callback together with its aliases."""
+        self._remove_words(keyword.lower())
+        self._invalidate_matcher()
+
+    def _remove_words(self, keyword: str) -> None:
+        """Drop the lowercase keyword and every alias registered for it."""
+        self._callbacks = {word: entry for word, entry in self._callbacks.items() if entry[0] != keyword}
+
+    def _invalidate_matcher(self) -> None:
+        """Drop the compiled keyword matcher and update the recognizer grammar."""
+        self._hyperscan_db = None
+        self._automaton = None
+        self._keyword_re = None
+        grammar = self._grammar()
+        if self._running and grammar is not None:
+            self._send(("grammar", grammar))
+
+    def _grammar(self) -> Optional[str]:
+        """
+        Build the Vosk grammar: every keyword plus [unk] for all other speech.
+
+        Returns None when grammars are disabled or no keyword is registered.
+        """
+        if not self.use_grammar or not self._callbacks:
+            return None
+        return json.dumps(sorted(self._callbacks) + ["[unk]"])
+
+    def _build_hyperscan_db(self) -> None:
+        """Compile all registered keywords into one whole-word Hyperscan database."""
+        words = list(self._callbacks)
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[(r"\b" + re.escape(w) + r"\b").encode() for w in words],
+            ids=list(range(len(words))),
+            elements=len(words),
+            # No SINGLEMATCH: a match outside the scanned span must not hide one inside it
+            flags=[hyperscan.HS_FLAG_CASELESS] * len(words)
+        )
+        self._hyperscan_keywords = words
+        self._hyperscan_lengths = [len(w.encode()) for w in words]
+        self._hyperscan_db = database
+
+    def _build_automaton(self) -> None:
+        """Build a pyahocorasick automaton over all registered keywords."""
+        automaton = ahocorasick.Automaton()
+        for word, entry in self._callbacks.items():
+            automaton.add_word(word, (word, entry))
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    def _iter_matches(
+        self,
+        text: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Iterator[Tuple[str, Tuple[str, Callable]]]:
+        """
+        Yield (word, (keyword, callback)) for every whole-word occurrence of a
+        registered keyword or alias in text.
+
+        The text is scanned in a single pass, by a Hyperscan SIMD database or a
+        pyahocorasick automaton when available, or else by a compiled regex
+        alternation. Only whole words match, so 'stop' does not fire on
+        'stopwatch'. Hyperscan scans bytes, so the whole text is encoded once
+        and matches outside [start, end) are dropped by offset; the other
+        matchers scan the str in place.
+
+        Args:
+            text: Lowercase text to scan
+            start: Index to start scanning from, to avoid slicing the text
+            end: Index to stop scanning at (exclusive), defaults to the end of text
+        """
+        if not self._callbacks:
+            return
+        if end is None:
+            end = len(text)
+
+        if hyperscan is not None:
+            if self._hyperscan_db is None:
+                self._build_hyperscan_db()
+            if text.isascii():
+                byte_start, byte_end = start, end
+            else:
+                byte_start = len(text[:start].encode())
+                byte_end = byte_start + len(text[start:end].encode())
+            matched = []
+            self._hyperscan_db.scan(
+                text.encode(),
+                match_event_handler=_collect_hyperscan_match,
+                context=matched
+            )
+            for match_id, match_end in matched:
+                if byte_start <= match_end - self._hyperscan_lengths[match_id] and match_end <= byte_end:
+                    word = self._hyperscan_keywords[match_id]
+                    yield word, self._callbacks[word]
+        elif ahocorasick is not None:
+            if self._automaton is None:
+                self._build_automaton()
+            for last, (word, entry) in self._automaton.iter(text, start, end):
+                if _is_boundary(text, last - len(word)) and _is_boundary(text, last + 1):
+                    yield word, entry
+        else:
+            if self._keyword_re is None:
+                self._keyword_re = _compile_keyword_re(self._callbacks)
+            for match in self._keyword_re.finditer(text, start, end):
+                word = match.group(1)
+                yield word, self._callbacks[word]
+
+    def _send(self, command: tuple) -> None:
+        """Send a command to the recognizer process and wake it up."""
+        self._commands.put(command)
+        self._data_ready.set()
+
+    def _start_worker(self) -> None:
+        """
+        Create the shared ring buffer on first use and spawn the recognizer process.
+
+        A watcher thread reports the process exiting, so that nothing waits
+        forever on a recognizer that crashed.
+        """
+        if self._ring is None:
+            atexit.register(self.close)
+            self._ring = shared_memory.SharedMemory(create=True, size=self.RING_SLOTS * self._slot_size)
+            self._written = self._ctx.RawValue("Q", 0)
+            self._data_ready = self._ctx.Event()
+            self._commands = self._ctx.SimpleQueue()
+            self._results = self._ctx.SimpleQueue()
+
+        options = {
+            "model_path": self.model_path,
+            "rate": self.rate,
+            "use_gpu": self.use_gpu,
+            "use_grammar": self.use_grammar,
+            "verbose": self.verbose,
+            "realtime_priority": self.REALTIME_PRIORITY,
+            "fallback_nice": self.FALLBACK_NICE
+        }
+        self._worker = self._ctx.Process(
+            target=_asr_worker,
+            args=(self._ring.name, self.RING_SLOTS, self._slot_size, self._written,
+                  self._data_ready, self._commands, self._results, options),
+            name="vosk-recognizer",
+            daemon=True
+        )
+        self._worker.start()
+        threading.Thread(target=self._watch_worker, args=(self._worker,), daemon=True).start()
+
+    def _watch_worker(self, worker) -> None:
+        """Wait for the recognizer process to end and wake up its readers (runs in separate thread)."""
+        worker.join()
+        self._results.put((self._session, "failed", f"recognizer process exited with code {worker.exitcode}"))
+
+    def _wait_for_recognizer(self, session: int) -> None:
+        """
+        Block until the recognizer process has loaded the model for a session.
+
+        Raises:
+            RuntimeError: If the recognizer could not be created
+        """
+        while True:
+            result_session, kind, detail = self._results.get()
+            if result_session != session:
+                continue
+            if kind == "ready":
+                return
+            if kind == "failed":
+                raise RuntimeError(f"Could not start the recognizer: {detail}")
 
     def _initialize_audio(self) -> None:
-        """Initialize Vosk model and PyAudio stream."""
-        if self.verbose:
-            print(f"Loading Vosk model from {self.model_path}...")
+        """
+        Start a recognition session and, on first use, the PyAudio stream.
 
-        self._model = vosk.Model(self.model_path)
-        self._recognizer = vosk.KaldiRecognizer(self._model, self.rate)
-        self._recognizer.SetWords(True)
+        Waits for the recognizer process to load the model, so a bad model
+        path raises here. The recognizer process and the stream stay up across
+        stop()/start() so neither the model nor the audio device is reloaded
+        every time; both are released by close() or at interpreter exit.
+        """
+        if self._worker is None or not self._worker.is_alive():
+            self._start_worker()
+        self._session += 1
+        self._send(("start", self._grammar(), self._session))
+        self._wait_for_recognizer(self._session)
+
+        if self._stream is not None:
+            return
 
         self._audio = pyaudio.PyAudio()
         self._stream = self._audio.open(
@@ -79,62 +582,163 @@ class AudioKeywordDetector:
             channels=1,
             rate=self.rate,
             input=True,
-            frames_per_buffer=self.chunk
+            frames_per_buffer=self.chunk,
+            stream_callback=self._pa_cb
         )
         self._stream.start_stream()
 
         if self.verbose:
             print("Audio stream initialized")
 
+    def _pa_cb(self, in_data, frame_count, time_info, status):
+        """
+        PyAudio stream callback, runs on PortAudio's capture thread.
+
+        Only copies the captured frames into the next ring buffer slot and
+        wakes the recognizer process, so capture keeps going while it is busy.
+        If recognition falls a full ring behind, the oldest chunks are dropped.
+        Frames captured while the detector is stopped are discarded.
+        """
+        if self._running:
+            data = in_data[:self._slot_size - _SLOT_HEADER.size]
+            offset = (self._written.value % self.RING_SLOTS) * self._slot_size
+            _SLOT_HEADER.pack_into(self._ring.buf, offset, len(data))
+            start = offset + _SLOT_HEADER.size
+            self._ring.buf[start:start + len(data)] = data
+            self._written.value += 1
+            self._data_ready.set()
+        return (None, pyaudio.paContinue)
+
     def _cleanup_audio(self) -> None:
         """Clean up audio resources."""
         if self._stream:
             self._stream.stop_stream()
             self._stream.close()
+            self._stream = None
         if self._audio:
             self._audio.terminate()
-
-    def _detect_keywords(self, text: str) -> None:
+            self._audio = None
+
+    def _stop_worker(self) -> None:
+        """Shut down the recognizer process and free the ring buffer."""
+        if self._worker is not None:
+            if self._worker.is_alive():
+                self._send(("close",))
+                self._worker.join(timeout=self.WORKER_JOIN_TIMEOUT)
+            if self._worker.is_alive():
+                self._worker.terminate()
+                self._worker.join()
+            self._worker = None
+        if self._ring is not None:
+            self._ring.close()
+            self._ring.unlink()
+            self._ring = None
+
+    def _detect_keywords(self, text: str, start: int = 0, end: Optional[int] = None) -> None:
         """
         Check transcribed text for registered keywords and trigger callbacks.
 
+        Each keyword fires at most once per utterance, so repeated partial
+        results for the same speech do not re-trigger it, and neither does
+        one of its aliases (e.g. "player pliers" fires 'pliers' once).
+
         Args:
             text: Transcribed text to check for keywords
+            start: Index in text where the transcription starts
+            end: Index in text where the transcription ends (exclusive)
+        """
+        # Vosk already emits lowercase text, so only copy it when needed
+        text_lower = text if text.islower() else text.lower()
+        for word, (keyword, callback) in self._iter_matches(text_lower, start, end):
+            if keyword in self._fired:
+                continue
+            self._fired.add(keyword)
+            if self.verbose:
+                heard = "" if word == keyword else f" (heard '{word}')"
+                print(f"Keyword '{keyword}'{heard} detected - triggering callback")
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error executing callback for '{keyword}': {e}")
+
+    def _handle_result(self, raw_result: str) -> None:
+        """
+        Parse a final recognizer result and check it for keywords.
+
+        Keywords already fired from partial results are not triggered again,
+        and the per-utterance state is reset afterwards.
+
+        Args:
+            raw_result: JSON result from the recognizer (may be empty in batch mode)
+        """
+        if not raw_result:
+            return
+
+        result = _json_loads(raw_result)
+        text = result.get('text', '')
+
+        if text:
+            if self.verbose:
+                print(f"Recognized: {text}")
+            self._detect_keywords(text)
+        self._fired.clear()
+
+    def _handle_partial(self, raw_partial: str) -> None:
+        """
+        Check a partial recognizer result for keywords so commands fire mid-utterance.
+
+        The text is located in the raw JSON (e.g. '{"partial" : "hello world"}')
+        and scanned in place; the JSON is only parsed if it looks unusual.
+
+        Args:
+            raw_partial: JSON partial result from the recognizer
+        """
+        span = _partial_span(raw_partial)
+        if span is None:
+            text = _json_loads(raw_partial).get('partial', '')
+            start, end = 0, len(text)
+        else:
+            text = raw_partial
+            start, end = span
+
+        if start == end:
+            return
+
+        self._detect_keywords(text, start, end)
+
+        # Throttled: printing every chunk can block the listener on a slow terminal
+        if self.verbose:
+            now = time.monotonic()
+            if now - self._last_partial_print >= self.PARTIAL_PRINT_INTERVAL:
+                self._last_partial_print = now
+                print(f"Partial: {text[start:end]}", end='\r')
+
+    def _listen_loop(self, session: int) -> None:
+        """
+        Dispatch output from the recognizer process (runs in separate thread).
+
+        Args:
+            session: Recognition session to dispatch; output of earlier
+                     sessions still in the queue is skipped
         """
-        text_lower = text.lower()
-        for keyword, callback in self._callbacks.items():
-            if keyword in text_lower:
-                if self.verbose:
-                    print(f"Keyword '{keyword}' detected - triggering callback")
-                try:
-                    callback()
-                except Exception as e:
-                    print(f"Error executing callback for '{keyword}': {e}")
-
-    def _listen_loop(self) -> None:
-        """Main listening loop (runs in separate thread)."""
         try:
-            while self._running:
-                data = self._stream.read(self.chunk, exception_on_overflow=False)
-
-                if self._recognizer.AcceptWaveform(data):
-                    result = json.loads(self._recognizer.Result())
-                    text = result.get('text', '')
-
-                    if text:
-                        if self.verbose:
-                            print(f"Recognized: {text}")
-                        self._detect_keywords(text)
-                else:
-                    partial = json.loads(self._recognizer.PartialResult())
-                    partial_text = partial.get('partial', '')
-                    if partial_text and self.verbose:
-                        print(f"Partial: {partial_text}", end='\r')
+            while True:
+                result_session, kind, raw = self._results.get()
+                if result_session != session:
+                    continue
+                if kind is None:  # Pushed by stop()
+                    break
+                if kind == "failed":
+                    print(f"Recognizer stopped: {raw}")
+                    self._running = False
+                    break
+                if kind == "result":
+                    self._handle_result(raw)
+                elif kind == "partial":
+                    self._handle_partial(raw)
 
         except Exception as e:
             print(f"Error in listening loop: {e}")
-        finally:
-            self._cleanup_audio()
 
     def start(self, blocking: bool = False) -> None:
         """
@@ -149,33 +753,46 @@ class AudioKeywordDetector:
             return
 
         self._initialize_audio()
+        self._fired.clear()
         self._running = True
 
         if self.verbose:
+            # Flush each line as it is printed, even when stdout is a pipe or journald
+            if hasattr(sys.stdout, "reconfigure"):
+                sys.stdout.reconfigure(line_buffering=True)
             keywords = ", ".join(f"'{k}'" for k in self._callbacks.keys())
             print(f"Listening for keywords: {keywords}")
             print("Press Ctrl+C to stop\n")
 
         if blocking:
             try:
-                self._listen_loop()
+                self._listen_loop(self._session)
             except KeyboardInterrupt:
                 if self.verbose:
                     print("\nStopping detector...")
                 self.stop()
         else:
-            self._thread = threading.Thread(target=self._listen_loop, daemon=True)
+            self._thread = threading.Thread(target=self._listen_loop, args=(self._session,), daemon=True)
             self._thread.start()
 
     def stop(self) -> None:
-        """Stop listening and clean up resources."""
+        """Stop listening; the audio stream and recognizer process are kept for the next start()."""
         self._running = False
+        if self._worker is not None:
+            self._send(("stop",))
+            self._results.put((self._session, None, None))
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2.0)
-        self._cleanup_audio()
         if self.verbose:
             print("Detector stopped")
 
+    def close(self) -> None:
+        """Stop listening, release the audio device and end the recognizer process."""
+        if self._running:
+            self.stop()
+        self._cleanup_audio()
+        self._stop_worker()
+
     def is_running(self) -> bool:
         """Check if detector is currently running."""
         return self._running
@@ -195,6 +812,8 @@ def main():
         detector.start(blocking=True)
     except KeyboardInterrupt:
         detector.stop()
+    finally:
+        detector.close()
 
 
 if __name__ == "__main__":
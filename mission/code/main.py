@@ -1,16 +1,28 @@
-import subprocess
-import time
+import asyncio
+import json
+import os
 import signal
-import queue
-import threading
+import sys
+import time
 import pyttsx3
 from audio_detection import AudioKeywordDetector
 
 # Maximum time per task (seconds)
 TASK_TIMEOUT = 60
 
-BASE_CMD_ARGS = [
-    "lerobot-record",
+# Time allowed for the recorder to stop a task before it is killed (seconds)
+STOP_TIMEOUT = 2
+
+# Pending voice messages kept before new ones are dropped
+TTS_QUEUE_SIZE = 4
+
+# A message identical to the last one spoken within this window is skipped (seconds)
+TTS_COALESCE_WINDOW = 1.0
+
+# Long-lived lerobot-record wrapper, started once and reused for every task
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "record_worker.py")
+
+RECORD_ARGS = [
     "--robot.type=so101_follower",
     "--robot.port=/dev/ttyACM1",
     "--robot.id=follower_arm",
@@ -38,17 +50,24 @@ class VoiceControlledRobot:
     """Voice-controlled robot task manager with interruption support."""
 
     def __init__(self):
-        self.current_process = None
+        self.worker = None
+        self._worker_reader = None  # Task forwarding the worker's status events
+        self._worker_ready = None  # asyncio.Event set once the worker has warmed up
+        self._retired_worker = None  # Task reaping a worker that exits to free the robot
+        self._worker_lock = None  # asyncio.Lock so concurrent respawns start a single worker
+        self._shutting_down = False
+        self._task_done = None  # Future resolved with the status of the running task
+        self._timeout_timer = None  # Handle of the running task's timeout callback
         self.current_task_name = None
         self.current_task_key = None  # Track which task is currently running
-        self.command_queue = queue.Queue()
+        self.command_queue = None  # asyncio.Queue, created by run() on its event loop
+        self._loop = None
         self.detector = AudioKeywordDetector(verbose=True)
-        self._running = True
 
         # Initialize text-to-speech engine
         self.tts_engine = pyttsx3.init()
         self.tts_engine.setProperty('rate', 150)  # Speed of speech
-        self.tts_lock = threading.Lock()  # Thread safety for TTS
+        self._tts_queue = None
 
         # Register voice commands with aliases from audio_detection.py
         self.detector.register_keyword("glove", lambda: self._on_task_command("glove"))
@@ -56,63 +75,254 @@ class VoiceControlledRobot:
         self.detector.register_keyword("pliers", lambda: self._on_task_command("pliers"), aliases=["player", "players", "playoffs"])
         self.detector.register_keyword("stop", lambda: self._on_stop_command(), aliases=["step"])
 
+    def _queue_command(self, cmd_type, cmd_data):
+        """Hand a command to the event loop (thread-safe)."""
+        self._loop.call_soon_threadsafe(self.command_queue.put_nowait, (cmd_type, cmd_data))
+
     def _speak(self, text):
         """
-        Speak text using TTS engine (thread-safe).
+        Queue text for the TTS worker without blocking (thread-safe).
+
+        The message is dropped if the worker already has too many pending.
 
         Args:
             text: Text to speak
         """
-        with self.tts_lock:
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
+        self._loop.call_soon_threadsafe(self._queue_speech, text)
+
+    def _queue_speech(self, text):
+        """Add text to the TTS queue (runs on the event loop)."""
+        try:
+            self._tts_queue.put_nowait(text)
+        except asyncio.QueueFull:
+            print(f"[TTS] Queue full - dropping '{text}'")
+
+    def _say(self, text):
+        """Speak text and wait for the engine to finish (blocking)."""
+        self.tts_engine.say(text)
+        self.tts_engine.runAndWait()
+
+    async def _tts_worker(self):
+        """Speak queued messages one at a time, skipping immediate repeats."""
+        last_text = None
+        last_time = 0.0
+
+        while True:
+            text = await self._tts_queue.get()
+            if text == last_text and time.time() - last_time < TTS_COALESCE_WINDOW:
+                continue
+
+            try:
+                # pyttsx3 releases the GIL while speaking, so this does not stall the loop
+                await asyncio.to_thread(self._say, text)
+            except Exception as e:
+                print(f"[TTS] Error speaking '{text}': {e}")
+
+            last_text = text
+            last_time = time.time()
 
     def _on_task_command(self, task_key):
         """Called when a task keyword is detected."""
         # Check if the same task is already running
-        if self.current_task_key == task_key and self.current_process and self.current_process.poll() is None:
+        if self.current_task_key == task_key:
             print(f"\n[VOICE] '{task_key}' already running - ignoring duplicate command")
             return
 
-        self.command_queue.put(("task", task_key))
+        self._queue_command("task", task_key)
         print(f"\n[VOICE] '{task_key}' command detected - queued")
 
         # Voice confirmation
         confirmation = f"{task_key.capitalize()} detected, starting task"
-        threading.Thread(target=self._speak, args=(confirmation,), daemon=True).start()
+        self._speak(confirmation)
 
     def _on_stop_command(self):
         """Called when stop keyword is detected."""
-        self.command_queue.put(("stop", None))
+        self._queue_command("stop", None)
         print(f"\n[VOICE] 'stop' command detected - stopping current task")
 
         # Voice confirmation
         confirmation = "Stop command received, stopping current task"
-        threading.Thread(target=self._speak, args=(confirmation,), daemon=True).start()
+        self._speak(confirmation)
+
+    async def _start_worker(self):
+        """Launch the recorder worker process, unless one is already running."""
+        async with self._worker_lock:
+            if self.worker is not None:
+                return
+            if self._retired_worker is not None:
+                # The serial port and cameras are only free once it has exited
+                await self._retired_worker
+                self._retired_worker = None
+
+            print("🔥 Starting recorder worker...")
+            self._worker_ready = asyncio.Event()
+            self.worker = await asyncio.create_subprocess_exec(
+                sys.executable, WORKER_SCRIPT, *RECORD_ARGS,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                # Own process group, so a hard kill also reaches the processes it spawns
+                # and Ctrl+C in the terminal is left for run() to handle
+                start_new_session=True
+            )
+            self._worker_reader = asyncio.create_task(self._read_worker_events(self.worker))
+
+    async def _read_worker_events(self, worker):
+        """
+        Follow a recorder worker's status events.
 
-    def _stop_current_task(self):
-        """Stop the currently running task process."""
-        if self.current_process and self.current_process.poll() is None:
-            print(f"\n🛑 Stopping task '{self.current_task_name}'...")
-            self.current_process.send_signal(signal.SIGINT)
+        Marks the worker ready once it has warmed up, resolves the running task
+        when the worker reports it done or exits, and replaces a worker that
+        dies or retires after warming up so the next command does not pay for
+        a cold start.
+        """
+        was_ready = False
+        retiring = False
+        async for line in worker.stdout:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                print(f"[WORKER] Ignoring malformed status line: {line!r}")
+                continue
+            if self.worker is not worker and not retiring:
+                continue
+            if event["event"] == "ready":
+                was_ready = True
+                self._worker_ready.set()
+                print("✅ Recorder worker warm and ready")
+            elif event["event"] == "started":
+                self._arm_timeout()
+            elif event["event"] == "retiring":
+                # It could not release the robot and cameras after a stop and
+                # exits after this session; send it nothing more
+                retiring = True
+                self.worker = None
+                self._retired_worker = asyncio.create_task(self._reap_worker(worker))
+            elif event["event"] == "done":
+                self._finish_task(event.get("status"))
+                if retiring:
+                    # Processes it leaves behind may keep stdout open
+                    break
 
+        await worker.wait()
+        if self.worker is worker:
+            self.worker = None
+            self._finish_task("exited")
+            # Don't respawn a worker that cannot even start, it would loop forever
+            if was_ready and not self._shutting_down:
+                print("💀 Recorder worker exited unexpectedly")
+                await self._start_worker()
+        elif retiring and not self._shutting_down:
+            print("♻️ Recorder worker retired to free the robot and cameras")
+            await self._start_worker()
+
+    async def _reap_worker(self, worker):
+        """Wait for a retiring worker to exit, then kill anything it left in its group."""
+        await worker.wait()
+        self._kill_process_group(worker)
+
+    def _finish_task(self, status):
+        """Record how the running task ended and wake up the monitor."""
+        task_done = self._task_done
+        if task_done is not None and not task_done.done():
+            task_done.set_result(status)
+            self.command_queue.put_nowait(("finished", task_done))
+
+    def _arm_timeout(self):
+        """Start the running task's timeout once the worker has really started it."""
+        if self._task_done is not None and self._timeout_timer is None:
+            self._timeout_timer = self._loop.call_later(TASK_TIMEOUT, self._on_timeout, self._task_done)
+
+    def _on_timeout(self, task_done):
+        """Wake up the monitor when a task runs out of time (runs on the event loop)."""
+        self.command_queue.put_nowait(("timeout", task_done))
+
+    def _kill_process_group(self, worker):
+        """SIGKILL the worker and every process left in its process group."""
+        try:
+            os.killpg(worker.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    async def _kill_worker(self):
+        """Kill the recorder worker; a new one is started for the next task."""
+        worker, self.worker = self.worker, None
+        if worker:
+            self._kill_process_group(worker)
+            await worker.wait()
+
+    async def _shutdown_worker(self):
+        """Let the recorder worker exit by closing its input, killing it if needed."""
+        worker = self.worker
+        if worker:
+            worker.stdin.close()
             try:
-                self.current_process.wait(timeout=5)
+                await asyncio.wait_for(worker.wait(), STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            # Also clears out anything the worker left running
+            self._kill_process_group(worker)
+            await worker.wait()
+            self.worker = None
+        if self._worker_reader:
+            await self._worker_reader
+        if self._retired_worker:
+            await self._retired_worker
+
+    async def _send_to_worker(self, message):
+        """
+        Send a JSON command to the recorder worker.
+
+        Returns:
+            False if the worker is no longer running
+        """
+        if self.worker is None:
+            return False
+        try:
+            self.worker.stdin.write(json.dumps(message).encode() + b"\n")
+            await self.worker.stdin.drain()
+            return True
+        except (BrokenPipeError, ConnectionResetError):
+            return False
+
+    def _clear_current_task(self):
+        """Forget the task that was running."""
+        if self._timeout_timer is not None:
+            self._timeout_timer.cancel()
+            self._timeout_timer = None
+        self.current_task_name = None
+        self.current_task_key = None
+        self._task_done = None
+
+    async def _stop_current_task(self):
+        """Stop the currently running task."""
+        if self.current_task_key is not None:
+            print(f"\n🛑 Stopping task '{self.current_task_name}'...")
+
+            stopped = False
+            if await self._send_to_worker({"cmd": "stop"}):
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._task_done), STOP_TIMEOUT)
+                    stopped = True
+                except asyncio.TimeoutError:
+                    pass
+
+            if stopped:
                 print(f"✅ Task '{self.current_task_name}' stopped cleanly")
-            except subprocess.TimeoutExpired:
-                self.current_process.kill()
+            else:
+                await self._kill_worker()
                 print(f"💀 Task '{self.current_task_name}' killed forcefully")
+                if not self._shutting_down:
+                    # Warm up a replacement now rather than when the next command comes
+                    await self._start_worker()
 
-            self.current_process = None
-            self.current_task_name = None
-            self.current_task_key = None
+            self._clear_current_task()
 
-    def _start_task(self, task_key):
+    async def _start_task(self, task_key):
         """Start a new task."""
         if task_key not in VOICE_TASKS:
             print(f"❌ Unknown task: {task_key}")
             error_msg = f"Unknown task: {task_key}"
-            threading.Thread(target=self._speak, args=(error_msg,), daemon=True).start()
+            self._speak(error_msg)
             return
 
         task_name = VOICE_TASKS[task_key]
@@ -120,64 +330,85 @@ class VoiceControlledRobot:
         timestamp = int(time.time())
         unique_repo_id = f"lleeoogg/eval_LeCoup-De-Pouce_{safe_task_name}_{timestamp}"
 
-        cmd = BASE_CMD_ARGS + [
-            f"--dataset.repo_id={unique_repo_id}",
-            f"--dataset.single_task={task_name}"
-        ]
-
         print(f"\n{'='*60}")
         print(f"▶ STARTING TASK: {task_name}")
         print(f"⏱  Max duration: {TASK_TIMEOUT} seconds")
         print(f"{'='*60}\n")
 
-        self.current_process = subprocess.Popen(cmd)
+        if self.worker is None:
+            await self._start_worker()
+        if not self._worker_ready.is_set():
+            print("⏳ Recorder worker still warming up - task starts once it is ready")
+        self._task_done = self._loop.create_future()
+        if not await self._send_to_worker({"task": task_name, "repo_id": unique_repo_id}):
+            print(f"❌ Recorder worker is not running, cannot start '{task_name}'")
+            await self._kill_worker()
+            self._task_done = None
+            return
+
         self.current_task_name = task_name
         self.current_task_key = task_key
 
-    def _monitor_task(self):
-        """Monitor current task for timeout."""
-        if not self.current_process:
-            return
+    def _report_task_end(self, status):
+        """Announce how a task that was not stopped by us ended."""
+        if status == "completed":
+            print(f"\n✅ Task '{self.current_task_name}' completed naturally")
+            completion_msg = "Task completed"
+            self._speak(completion_msg)
+        else:
+            print(f"\n❌ Task '{self.current_task_name}' ended: {status}")
+            self._speak("Task failed")
 
-        start_time = time.time()
+    async def _wait_for_task(self):
+        """
+        Wait until the current task finishes, times out, is stopped or is replaced.
 
-        while self.current_process and self.current_process.poll() is None:
-            # Check for timeout
-            if time.time() - start_time > TASK_TIMEOUT:
-                print(f"\n⏰ TIMEOUT ({TASK_TIMEOUT}s) reached!")
-                timeout_msg = "Timeout reached"
-                threading.Thread(target=self._speak, args=(timeout_msg,), daemon=True).start()
-                self._stop_current_task()
+        Returns:
+            The key of the task that should replace the current one, or None
+        """
+        while True:
+            # The timeout arrives on the queue too, so this never polls the clock
+            cmd_type, cmd_data = await self.command_queue.get()
+
+            if cmd_type == "timeout":
+                # Ignore the timeout of a task that already ended
+                if cmd_data is self._task_done:
+                    print(f"\n⏰ TIMEOUT ({TASK_TIMEOUT}s) reached!")
+                    timeout_msg = "Timeout reached"
+                    self._speak(timeout_msg)
+                    await self._stop_current_task()
+                    return None
+            elif cmd_type == "finished":
+                if cmd_data is self._task_done:
+                    self._report_task_end(cmd_data.result())
+                    self._clear_current_task()
+                    return None
+            elif cmd_type == "stop":
+                await self._stop_current_task()
+                return None
+            elif cmd_type == "task":
+                return cmd_data
+
+    async def _monitor_task(self):
+        """Monitor current task for timeout, following any task that replaces it."""
+        while self.current_task_key is not None:
+            next_task = await self._wait_for_task()
+            if next_task is None:
                 break
 
-            # Check for new commands
-            try:
-                cmd_type, cmd_data = self.command_queue.get(timeout=0.1)
-
-                if cmd_type == "stop":
-                    self._stop_current_task()
-                    break
-                elif cmd_type == "task":
-                    # New task requested - stop current and start new
-                    self._stop_current_task()
-                    self._start_task(cmd_data)
-                    # Restart monitoring for new task
-                    return self._monitor_task()
-
-            except queue.Empty:
-                continue
-
-        # Task finished naturally
-        if self.current_process and self.current_process.poll() is not None:
-            print(f"\n✅ Task '{self.current_task_name}' completed naturally")
-            completion_msg = "Task completed"
-            threading.Thread(target=self._speak, args=(completion_msg,), daemon=True).start()
-            self.current_process = None
-            self.current_task_name = None
-            self.current_task_key = None
+            # New task requested - stop current and start new
+            await self._stop_current_task()
+            await self._start_task(next_task)
 
-    def run(self):
+    async def run(self):
         """Main control loop."""
+        self._loop = asyncio.get_running_loop()
+        self.command_queue = asyncio.Queue()
+        self._worker_lock = asyncio.Lock()
+        self._tts_queue = asyncio.Queue(maxsize=TTS_QUEUE_SIZE)
+        tts_task = asyncio.create_task(self._tts_worker())
+        self._loop.add_signal_handler(signal.SIGINT, asyncio.current_task().cancel)
+
         print("\n" + "="*60)
         print("VOICE-CONTROLLED ROBOT SYSTEM")
         print("="*60)
@@ -188,33 +419,36 @@ class VoiceControlledRobot:
         print("\nPress Ctrl+C to quit")
         print("="*60 + "\n")
 
-        # Start audio detector
-        self.detector.start(blocking=False)
-
         try:
-            while self._running:
-                # Wait for commands
-                try:
-                    cmd_type, cmd_data = self.command_queue.get(timeout=0.5)
+            # Pay for lerobot, torch and CUDA initialization once, at launch
+            await self._start_worker()
+
+            # Start audio detector; blocks until its recognizer process has loaded
+            # the Vosk model (raising if it cannot), so off the event loop
+            await asyncio.to_thread(self.detector.start, blocking=False)
 
-                    if cmd_type == "task":
-                        # Stop any running task and start new one
-                        self._stop_current_task()
-                        self._start_task(cmd_data)
-                        self._monitor_task()
-                    elif cmd_type == "stop":
-                        self._stop_current_task()
+            while True:
+                # Wait for commands
+                cmd_type, cmd_data = await self.command_queue.get()
 
-                except queue.Empty:
-                    continue
+                if cmd_type == "task":
+                    # Stop any running task and start new one
+                    await self._stop_current_task()
+                    await self._start_task(cmd_data)
+                    await self._monitor_task()
+                elif cmd_type == "stop":
+                    await self._stop_current_task()
 
-        except KeyboardInterrupt:
+        except asyncio.CancelledError:
             print("\n\n✂️ Shutdown requested...")
         finally:
-            self._stop_current_task()
-            self.detector.stop()
+            self._shutting_down = True
+            await self._stop_current_task()
+            await self._shutdown_worker()
+            await asyncio.to_thread(self.detector.close)
+            tts_task.cancel()
             print("👋 Robot system stopped")
 
 if __name__ == "__main__":
     robot = VoiceControlledRobot()
-    robot.run()
+    asyncio.run(robot.run())
@@ -0,0 +1,255 @@
+"""
+Long-lived wrapper around lerobot-record.
+
+lerobot-record has no interactive mode, so this script imports its entry
+point once (paying for torch, lerobot and the CUDA context up front) and then
+runs one recording session per JSON command read from stdin:
+
+    {"task": "<task description>", "repo_id": "<dataset repo id>"}
+    {"cmd": "stop"}
+
+Status is reported as JSON lines on stdout:
+
+    {"event": "ready"}
+    {"event": "started"}
+    {"event": "done", "status": "completed" | "stopped" | "failed"}
+
+Commands are read from the moment the script starts, so a stop sent while
+it is still warming up is acknowledged right away: tasks that have not
+started yet are reported done with status "stopped" and never run.
+
+Everything else written to stdout (by lerobot or its libraries) is redirected
+to stderr so it cannot corrupt the protocol.
+
+A stopped session is interrupted with KeyboardInterrupt, which skips
+lerobot-record's own teardown, so the wrapper disconnects the robot and
+teleoperator and stops the keyboard listener itself before the next session
+connects to them again. If that is not possible the worker reports
+
+    {"event": "retiring"}
+
+and exits, leaving the operating system to close the serial port and cameras.
+
+Usage: python record_worker.py <lerobot-record arguments...>
+"""
+import functools
+import json
+import os
+import queue
+import signal
+import sys
+import threading
+import traceback
+
+# Keep the real stdout for the protocol and send all other output to stderr
+_protocol = os.fdopen(os.dup(1), "w", buffering=1)
+os.dup2(2, 1)
+sys.stdout = sys.stderr
+
+_protocol_lock = threading.Lock()  # Status lines come from both threads
+
+# Factories lerobot-record opens devices with; their results are tracked so an
+# interrupted session can be torn down
+DEVICE_FACTORIES = ("make_robot_from_config", "make_teleoperator_from_config", "init_keyboard_listener")
+
+
+def _emit(event, **fields):
+    """Write one status line to the controlling process."""
+    with _protocol_lock:
+        _protocol.write(json.dumps({"event": event, **fields}) + "\n")
+
+
+def _import_record():
+    """Import the lerobot-record module (slow: pulls in torch and lerobot)."""
+    try:
+        from lerobot.scripts import lerobot_record as record_module
+    except ImportError:
+        from lerobot import record as record_module
+    return record_module
+
+
+def _warm_up():
+    """Create the CUDA context now instead of at the first task."""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.init()
+    except Exception as e:
+        print(f"[worker] CUDA warm-up skipped: {e}")
+
+
+class RecordWorker:
+    """Runs lerobot-record sessions on demand inside a single process."""
+
+    def __init__(self, record_args):
+        """
+        Args:
+            record_args: lerobot-record arguments shared by every session
+        """
+        self.record_args = record_args
+        self._commands = queue.Queue()
+        self._lock = threading.Lock()
+        self._received = 0  # Number of task commands read from stdin
+        self._cancelled = 0  # Tasks up to this number were stopped before starting
+        self._started = 0  # Number of the last task taken off the queue
+        self._active = None  # Number of the task currently recording
+        self._interrupted = False  # The active session was already sent SIGINT
+        self._module = None  # lerobot-record, imported by serve()
+        self._opened = []  # Devices created by the current session
+        self._can_release = False
+
+    def _track_devices(self):
+        """
+        Wrap lerobot-record's device factories to remember what each session opens.
+
+        Returns:
+            False if a factory is missing, so interrupted sessions cannot be torn down
+        """
+        for name in DEVICE_FACTORIES:
+            factory = getattr(self._module, name, None)
+            if factory is None:
+                print(f"[worker] lerobot-record has no {name}, retiring after interrupted sessions")
+                return False
+            setattr(self._module, name, self._tracking(factory))
+        return True
+
+    def _tracking(self, factory):
+        """Wrap a factory so that everything it returns is added to the session's devices."""
+        @functools.wraps(factory)
+        def wrapper(*args, **kwargs):
+            device = factory(*args, **kwargs)
+            self._opened.append(device)
+            return device
+        return wrapper
+
+    def _release_devices(self):
+        """
+        Disconnect and stop whatever the last session left open, newest first.
+
+        Returns:
+            True if everything was released
+        """
+        released = True
+        while self._opened:
+            device = self._opened.pop()
+            if isinstance(device, tuple):  # init_keyboard_listener returns (listener, events)
+                device = device[0]
+            try:
+                if hasattr(device, "disconnect"):
+                    if getattr(device, "is_connected", True):
+                        device.disconnect()
+                elif device is not None:  # No keyboard listener when headless
+                    device.stop()
+            except Exception as e:
+                print(f"[worker] Could not release {type(device).__name__}: {e}")
+                released = False
+        return released
+
+    def _on_sigint(self, signum, frame):
+        """Interrupt the running session; ignore SIGINT while idle."""
+        if self._active is not None:
+            raise KeyboardInterrupt
+
+    def _read_commands(self):
+        """Read commands from stdin (runs in separate thread)."""
+        for line in sys.stdin:
+            try:
+                command = json.loads(line)
+            except ValueError:
+                print(f"[worker] Ignoring malformed command: {line.strip()}")
+                continue
+
+            if command.get("cmd") == "stop":
+                self._stop()
+            elif "task" in command:
+                with self._lock:
+                    self._received += 1
+                    self._commands.put((self._received, command))
+
+        # Controlling process went away
+        self._stop()
+        self._commands.put(None)
+
+    def _stop(self):
+        """Stop the running session and drop tasks that have not started yet."""
+        with self._lock:
+            # Acknowledge queued tasks now, the main thread may still be warming up
+            for _ in range(max(self._cancelled, self._started), self._received):
+                _emit("done", status="stopped")
+            self._cancelled = self._received
+            # One SIGINT per session, so a second stop cannot interrupt the cleanup
+            if self._active is not None and not self._interrupted:
+                self._interrupted = True
+                signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+
+    def _record(self, command):
+        """
+        Run one lerobot-record session.
+
+        Returns:
+            "completed" or "failed"
+        """
+        sys.argv = [sys.argv[0]] + self.record_args + [
+            f"--dataset.repo_id={command['repo_id']}",
+            f"--dataset.single_task={command['task']}"
+        ]
+        try:
+            self._module.main()
+        except SystemExit as e:
+            return "failed" if e.code else "completed"
+        except Exception:
+            traceback.print_exc()
+            return "failed"
+        return "completed"
+
+    def _run(self, number, command):
+        """
+        Run a queued task unless it was stopped before it could start.
+
+        Returns:
+            False if the session may have left devices open and the worker must exit
+        """
+        status = "failed"
+        try:
+            with self._lock:
+                self._started = number
+                if number <= self._cancelled:  # Already acknowledged by _stop()
+                    return True
+                self._active = number
+                self._interrupted = False
+            _emit("started")
+            self._opened.clear()
+            status = self._record(command)
+            self._active = None
+        except KeyboardInterrupt:
+            # At most one SIGINT is sent per session, so none can land after this
+            self._active = None
+            status = "stopped"
+
+        released = self._release_devices() and (self._can_release or status == "completed")
+        if not released:
+            _emit("retiring")
+        _emit("done", status=status)
+        return released
+
+    def serve(self):
+        """Process commands until stdin is closed."""
+        signal.signal(signal.SIGINT, self._on_sigint)
+        threading.Thread(target=self._read_commands, daemon=True).start()
+        self._module = _import_record()
+        self._can_release = self._track_devices()
+        _warm_up()
+        _emit("ready")
+
+        while True:
+            try:
+                item = self._commands.get()
+                if item is None or not self._run(*item):
+                    return
+            except KeyboardInterrupt:
+                # Stop request that raced with the end of a session
+                continue
+
+
+if __name__ == "__main__":
+    RecordWorker(sys.argv[1:]).serve()